@@ -3,46 +3,97 @@ from discord.ext import commands
 import logging
 from dotenv import load_dotenv
 import os
-import requests
+import aiohttp
+from aiohttp import web
 from bs4 import BeautifulSoup
+import soupsieve
+from lxml import etree
+import io
 import asyncio
-import json
+import orjson
+import hashlib
+import sqlite3
+import time
 from datetime import datetime
+from itertools import batched
+from typing import NamedTuple
 
 # --------------------------
 # Persistent Seen Releases & Cache
 # --------------------------
-SEEN_FILE = "seen_releases.json"
+class Release(NamedTuple):
+    title: str
+    chapter: str
+    group: str
+    key: str
+
+
+SEEN_DB = "seen.db"
+LEGACY_SEEN_FILES = ("seen_releases.jsonl", "seen_releases.json")
 CACHE_FILE = "releases_cache.json"
 
 
-def load_seen_releases():
-    if os.path.exists(SEEN_FILE):
-        with open(SEEN_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
+def seen_key(key):
+    """Hash a release key into the compact form stored in the seen table"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def load_legacy_seen_keys():
+    """Read release keys from the old JSONL/JSON seen files, if any"""
+    jsonl_file, json_file = LEGACY_SEEN_FILES
+    if os.path.exists(jsonl_file):
+        with open(jsonl_file, "rb") as f:
+            return {orjson.loads(line) for line in f if line.strip()}
+    if os.path.exists(json_file):
+        with open(json_file, "rb") as f:
+            return set(orjson.loads(f.read()))
     return set()
 
 
-def save_seen_releases():
-    with open(SEEN_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(seen_releases), f, ensure_ascii=False, indent=2)
+def open_seen_db():
+    conn = sqlite3.connect(SEEN_DB)
+    conn.execute("CREATE TABLE IF NOT EXISTS seen(k BLOB PRIMARY KEY) WITHOUT ROWID")
+    if conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None:
+        legacy_keys = load_legacy_seen_keys()
+        if legacy_keys:
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)",
+                                 ((seen_key(key),) for key in legacy_keys))
+    return conn
 
 
 def load_cached_releases():
     if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(CACHE_FILE, "rb") as f:
+            rows = orjson.loads(f.read())
+        # Older cache files stored each release as a dict
+        return [Release(**row) if isinstance(row, dict) else Release(*row) for row in rows]
     return []
 
 
 def save_cached_releases(releases):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(releases, f, ensure_ascii=False, indent=2)
+    with open(CACHE_FILE, "wb") as f:
+        f.write(orjson.dumps([tuple(release) for release in releases]))
 
 
-seen_releases = load_seen_releases()
+seen_db = open_seen_db()
 cached_releases = load_cached_releases()
 
+# HTTP validators for conditional GETs of the releases page
+last_etag = None
+last_modified = None
+last_body_hash = None
+
+# Short-lived cache shared by the monitor and commands, so back-to-back calls coalesce
+RELEASES_TTL = 60
+recent_fetch = {"t": 0.0, "data": []}
+fetch_lock = asyncio.Lock()
+
+# CSS selectors for the BeautifulSoup scrapers, compiled once at import
+SEARCH_RESULT_SELECTOR = soupsieve.compile('div[class*="series" i], div[class*="result" i], div[class*="item" i]')
+SERIES_LINK_SELECTOR = soupsieve.compile('a[href*="/series.html?id="]')
+DESCRIPTION_SELECTOR = soupsieve.compile('div[class*="description" i]')
+
 # --------------------------
 # Load environment variables
 # --------------------------
@@ -65,107 +116,291 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
+# Request and embed constants
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+RELEASES_URL = "https://www.mangaupdates.com/releases.html"
+RELEASES_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+EMBED_COLOR = discord.Color.from_rgb(204, 153, 255)
+
+# Shared keep-alive HTTP session, opened in AmaneBot.setup_hook
+http_session = None
+MU_MAX_ATTEMPTS = 3
+MU_MAX_RATE_LIMIT_ATTEMPTS = 5
+
+# Cap concurrent requests to MangaUpdates across the monitor and all commands
+MU_SEM = asyncio.Semaphore(4)
+# Monotonic time before which no new MangaUpdates request is sent
+rate_limited_until = 0.0
+
+
+class AmaneBot(commands.Bot):
+    async def setup_hook(self):
+        # Runs once before connecting, so the session exists before any event or command
+        global http_session
+        http_session = aiohttp.ClientSession(headers={"User-Agent": USER_AGENT})
+        asyncio.create_task(monitor_new_releases())
+        await keep_alive()
+
+    async def close(self):
+        await super().close()
+        if web_runner is not None:
+            await web_runner.cleanup()
+        if http_session is not None:
+            await http_session.close()
+
+
 # Bot setup
-bot = commands.Bot(command_prefix='.', intents=intents)
+bot = AmaneBot(command_prefix='.', intents=intents)
 
 
 @bot.event
 async def on_ready():
     logging.info(f'✅ Bot ready: {bot.user.name}')
     logging.info(f'✅ Connected to {len(bot.guilds)} servers')
-    bot.loop.create_task(monitor_new_releases())
+
+
+WELCOME_EMBED_TEMPLATE = discord.Embed(
+    title="🎉 Welcome to Manhwa 만화!",
+    description=(
+        "{mention}, we're thrilled to have you here!\n\n"
+        "🌸 Dive into the world of Manhwa and connect with fellow fans.\n"
+        "📚 Be sure to check out the rules and channel guide.\n"
+        "🎭 Head over to the other channels and choose what role colors you'd like!\n"
+        "💬 Say hi and let us know your favorite manhwa!"
+    ),
+    color=EMBED_COLOR
+)
+WELCOME_EMBED_TEMPLATE.set_image(
+    url="https://media.discordapp.net/attachments/1256270163997888512/1423327225423466496/ba5d741935a6ad1ad678033a0d66ef72.jpg")
 
 
 @bot.event
 async def on_member_join(member):
-    embed = discord.Embed(
-        title="🎉 Welcome to Manhwa 만화!",
-        description=(
-            f"{member.mention}, we're thrilled to have you here!\n\n"
-            "🌸 Dive into the world of Manhwa and connect with fellow fans.\n"
-            "📚 Be sure to check out the rules and channel guide.\n"
-            "🎭 Head over to the other channels and choose what role colors you'd like!\n"
-            "💬 Say hi and let us know your favorite manhwa!"
-        ),
-        color=discord.Color.from_rgb(204, 153, 255)
-    )
-    embed.set_image(
-        url="https://media.discordapp.net/attachments/1256270163997888512/1423327225423466496/ba5d741935a6ad1ad678033a0d66ef72.jpg")
+    embed = WELCOME_EMBED_TEMPLATE.copy()
+    embed.description = WELCOME_EMBED_TEMPLATE.description.format(mention=member.mention)
     channel = bot.get_channel(948140724816330782)
     if channel:
         await channel.send(embed=embed)
 
 
+# --------------------------
+# MangaUpdates HTTP Helpers
+# --------------------------
+def retry_delay(attempt):
+    """Exponential backoff between retries: 0.5s, 1s, 2s, ..."""
+    return 0.5 * 2 ** attempt
+
+
+def rate_limit_delay(response, attempt):
+    """Seconds to hold off after a rate limit, honouring Retry-After when it is given in seconds"""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(60, int(retry_after))
+    return min(60, 2 ** attempt)
+
+
+def hold_requests(delay):
+    global rate_limited_until
+    rate_limited_until = max(rate_limited_until, time.monotonic() + delay)
+
+
+def is_rate_limited():
+    return time.monotonic() < rate_limited_until
+
+
+async def mu_get(url, headers=None, timeout=20):
+    """GET a MangaUpdates page on the shared session, retrying transient failures and 429s"""
+    attempt = 0
+    rate_limit_attempt = 0
+
+    while True:
+        # Rate-limit waits happen here, never while holding an MU_SEM slot
+        delay = rate_limited_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            async with MU_SEM:
+                async with http_session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    # Read the body now so callers can still await response.text() after release
+                    await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MU_MAX_ATTEMPTS - 1:
+                raise
+            logging.warning(f"⏳ Request to MangaUpdates failed ({e!r}), retrying")
+            await asyncio.sleep(retry_delay(attempt))
+            attempt += 1
+            continue
+
+        if response.status == 429:
+            if rate_limit_attempt == MU_MAX_RATE_LIMIT_ATTEMPTS - 1:
+                return response
+            delay = rate_limit_delay(response, rate_limit_attempt)
+            logging.warning(f"⏳ Rate limited by MangaUpdates, retrying in {delay}s")
+            hold_requests(delay)
+            rate_limit_attempt += 1
+            continue
+
+        # Out of request budget: pause the next request instead of waiting for a 429
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            hold_requests(rate_limit_delay(response, 0))
+
+        if response.status >= 500 and attempt < MU_MAX_ATTEMPTS - 1:
+            logging.warning(f"⏳ MangaUpdates returned {response.status}, retrying")
+            await asyncio.sleep(retry_delay(attempt))
+            attempt += 1
+            continue
+
+        return response
+
+
 # --------------------------
 # Fetch and Parse Releases
 # --------------------------
-def fetch_releases_from_page():
-    """Scrape the releases page and return ALL releases exactly as shown"""
-    global cached_releases
+def has_class(elem, name):
+    return name in (elem.get("class") or "").split()
+
+
+def element_text(elem):
+    return "".join(text.strip() for text in elem.itertext())
+
+
+def parse_releases(body, encoding=None):
+    """Stream-parse the raw releases page bytes into a list of Release records"""
+    releases = []
+    release_count = 0
+
+    # iterparse raises on a document with no elements at all
+    if not body.strip():
+        return releases
+
+    # Only "new-release-item" divs matter; everything else is freed as we go.
+    # Without an HTTP charset, libxml2 detects the encoding from the page itself.
+    context = etree.iterparse(io.BytesIO(body), events=("end",), tag="div",
+                              html=True, encoding=encoding)
+
+    for _, elem in context:
+        if not has_class(elem, "new-release-item"):
+            continue
+        release_count += 1
+
+        try:
+            # Find the three columns: col-6 (title), col-2 (release), col-4 (groups)
+            title_col = release_col = group_col = None
+            for column in elem.iter("div"):
+                if title_col is None and has_class(column, "col-6"):
+                    title_col = column
+                elif release_col is None and has_class(column, "col-2"):
+                    release_col = column
+                elif group_col is None and has_class(column, "col-4"):
+                    group_col = column
+
+            if title_col is not None and release_col is not None and group_col is not None:
+                # Column 1: Title (col-6)
+                title_elem = title_col.find(".//span")
+                title = element_text(title_elem) if title_elem is not None else element_text(title_col)
+
+                # Column 2: Release/Chapter (col-2)
+                release = element_text(release_col)
+
+                # Column 3: Groups (col-4)
+                group = element_text(group_col)
+
+                if title and release:
+                    releases.append(Release(title, release, group if group else "Unknown",
+                                            f"{title}|{release}|{group}"))
+                    logging.debug("Parsed: %s - %s - %s", title, release, group)
+
+        except Exception as e:
+            logging.warning(f"Error parsing individual release: {e}")
+
+        # Drop the processed row and any earlier siblings to keep memory flat
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    logging.info(f"Found {release_count} release divs")
+
+    return releases
+
+
+async def fetch_releases_from_page():
+    """Return the current releases, scraping at most once every RELEASES_TTL seconds"""
+    # Coalesce onto an in-flight scrape, unless it is sitting out a rate limit
+    while True:
+        try:
+            await asyncio.wait_for(fetch_lock.acquire(), timeout=1)
+            break
+        except asyncio.TimeoutError:
+            if is_rate_limited():
+                logging.warning("⚠️ MangaUpdates rate limit in effect, returning cached data")
+                return recent_fetch["data"] or cached_releases
 
     try:
-        url = "https://www.mangaupdates.com/releases.html"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-        }
-
-        response = requests.get(url, headers=headers, timeout=20)
-        response.raise_for_status()
+        if recent_fetch["data"] and time.monotonic() - recent_fetch["t"] < RELEASES_TTL:
+            return recent_fetch["data"]
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        releases = []
+        releases, fresh = await scrape_releases_page()
+        if fresh:
+            recent_fetch["t"] = time.monotonic()
+            recent_fetch["data"] = releases
+        return releases
+    finally:
+        fetch_lock.release()
 
-        # Find all release items - they use class containing "new-release-item"
-        release_divs = soup.find_all("div", class_=lambda x: x and "new-release-item" in str(x))
 
-        logging.info(f"Found {len(release_divs)} release divs")
+async def scrape_releases_page():
+    """Scrape the releases page and return (releases, fresh); fresh is False on stale fallback data"""
+    global cached_releases, last_etag, last_modified, last_body_hash
 
-        for release_div in release_divs:
-            try:
-                # Find the three columns: col-6 (title), col-2 (release), col-4 (groups)
-                columns = release_div.find_all("div", class_=lambda x: x and (
-                            "col-6" in str(x) or "col-2" in str(x) or "col-4" in str(x)))
-
-                if len(columns) >= 3:
-                    # Column 1: Title (col-6)
-                    title_elem = columns[0].find("span")
-                    title = title_elem.get_text(strip=True) if title_elem else columns[0].get_text(strip=True)
-
-                    # Column 2: Release/Chapter (col-2)
-                    release = columns[1].get_text(strip=True)
-
-                    # Column 3: Groups (col-4)
-                    group = columns[2].get_text(strip=True)
-
-                    if title and release:
-                        releases.append({
-                            "title": title,
-                            "chapter": release,
-                            "group": group if group else "Unknown",
-                            "key": f"{title}|{release}|{group}"
-                        })
-                        logging.debug(f"Parsed: {title} - {release} - {group}")
-
-            except Exception as e:
-                logging.warning(f"Error parsing individual release: {e}")
-                continue
+    try:
+        headers = RELEASES_HEADERS
+
+        if cached_releases:
+            headers = dict(RELEASES_HEADERS)
+            if last_etag:
+                headers["If-None-Match"] = last_etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = await mu_get(RELEASES_URL, headers=headers, timeout=20)
+        if response.status == 304:
+            logging.info("✅ Releases page not modified, using cached data")
+            return cached_releases, True
+        response.raise_for_status()
+        body = await response.read()
+        etag = response.headers.get("ETag")
+        modified = response.headers.get("Last-Modified")
+
+        # Fall back to a body digest when the server omits validators
+        body_hash = hashlib.sha1(body).hexdigest()
+        if cached_releases and body_hash == last_body_hash:
+            logging.info("✅ Releases page unchanged, using cached data")
+            return cached_releases, True
+
+        # Parsing is CPU-bound, keep it off the event loop so the gateway heartbeat keeps flowing
+        releases = await asyncio.to_thread(parse_releases, body, response.charset)
 
         if releases:
             logging.info(f"✅ Successfully parsed {len(releases)} releases from MangaUpdates")
             cached_releases = releases
             save_cached_releases(releases)
-            return releases
+            last_etag, last_modified, last_body_hash = etag, modified, body_hash
+            return releases, True
         else:
             logging.warning("⚠️ No releases parsed, returning cached data")
-            return cached_releases if cached_releases else []
+            return cached_releases if cached_releases else [], False
 
     except Exception as e:
         logging.error(f"❌ Error fetching releases: {e}, returning cached data")
-        import traceback
-        logging.error(traceback.format_exc())
-        return cached_releases if cached_releases else []
+        if logging.getLogger().isEnabledFor(logging.ERROR):
+            import traceback
+            logging.error(traceback.format_exc())
+        return cached_releases if cached_releases else [], False
 
 
 # --------------------------
@@ -181,21 +416,27 @@ async def monitor_new_releases():
         return
 
     logging.info("🔄 Starting hourly release monitor...")
+    last_tick_keys = set()
 
     while not bot.is_closed():
         try:
-            releases = fetch_releases_from_page()
+            releases = await fetch_releases_from_page()
             new_releases = []
 
-            # Check for new releases
-            for release in releases:
-                if release["key"] not in seen_releases:
-                    seen_releases.add(release["key"])
-                    new_releases.append(release)
+            # Releases already checked on the previous tick need no hashing or DB lookup
+            candidates = [release for release in releases if release.key not in last_tick_keys]
+
+            # Check for new releases, recording them in a single transaction
+            with seen_db:
+                for release in candidates:
+                    inserted = seen_db.execute("INSERT OR IGNORE INTO seen VALUES (?)",
+                                               (seen_key(release.key),)).rowcount
+                    if inserted == 1:
+                        new_releases.append(release)
+            last_tick_keys = {release.key for release in releases}
 
             if new_releases:
                 logging.info(f"🆕 Found {len(new_releases)} new releases")
-                save_seen_releases()
 
                 # Post new releases in batches of 5
                 chunk_size = 5
@@ -203,14 +444,14 @@ async def monitor_new_releases():
                     embed = discord.Embed(
                         title="🆕 New Manga/Manhwa Releases",
                         description="Fresh updates from MangaUpdates!",
-                        color=discord.Color.from_rgb(204, 153, 255),
+                        color=EMBED_COLOR,
                         timestamp=datetime.utcnow()
                     )
 
                     for release in new_releases[i:i + chunk_size]:
                         embed.add_field(
-                            name=f"📖 {release['title']}",
-                            value=f"**Release:** {release['chapter']}\n**Group:** {release['group']}",
+                            name=f"📖 {release.title}",
+                            value=f"**Release:** {release.chapter}\n**Group:** {release.group}",
                             inline=False
                         )
 
@@ -238,7 +479,7 @@ async def latestrelease(ctx):
 
     loading_msg = await ctx.send("🔍 Fetching all releases from MangaUpdates...")
 
-    releases = fetch_releases_from_page()
+    releases = await fetch_releases_from_page()
 
     await loading_msg.delete()
 
@@ -246,33 +487,42 @@ async def latestrelease(ctx):
         # Display ALL releases in chunks of 10
         chunk_size = 10
         total_releases = len(releases)
+        embeds = []
 
         for i in range(0, total_releases, chunk_size):
             chunk = releases[i:i + chunk_size]
 
             embed = discord.Embed(
                 title="📚 MangaUpdates Releases",
-                url="https://www.mangaupdates.com/releases.html",
+                url=RELEASES_URL,
                 description=f"Showing {i + 1}-{min(i + chunk_size, total_releases)} of {total_releases} total releases",
-                color=discord.Color.from_rgb(204, 153, 255),
+                color=EMBED_COLOR,
                 timestamp=datetime.utcnow()
             )
 
             for release in chunk:
                 # Truncate extremely long titles to fit Discord limits
-                title_display = release['title']
+                title_display = release.title
                 if len(title_display) > 80:
                     title_display = title_display[:77] + "..."
 
                 embed.add_field(
                     name=f"📖 {title_display}",
-                    value=f"**Release:** {release['chapter']}\n**Groups:** {release['group']}",
+                    value=f"**Release:** {release.chapter}\n**Groups:** {release.group}",
                     inline=False
                 )
 
             embed.set_footer(text="Live data from MangaUpdates")
-            await ctx.send(embed=embed)
-            await asyncio.sleep(0.5)
+            embeds.append(embed)
+
+        # Bursts of 4 with a 1s pause can exceed Discord's 5 messages / 5s channel bucket;
+        # discord.py's per-route rate limiter waits out the bucket when that happens.
+        # Sends stay sequential so the pages arrive in order.
+        for n, group in enumerate(batched(embeds, 4)):
+            if n:
+                await asyncio.sleep(1.0)
+            for embed in group:
+                await ctx.send(embed=embed)
     else:
         await ctx.send("📢 No release data available. Please try again in a moment!")
 
@@ -289,19 +539,15 @@ async def lookup(ctx, *, query):
 
     try:
         search_url = f"https://www.mangaupdates.com/series.html?search={query.replace(' ', '+')}"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
 
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = await mu_get(search_url, timeout=15)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(await response.text(), "lxml")
 
         # Find search results
         results = []
-        series_items = soup.find_all("div", class_=lambda x: x and any(
-            word in str(x).lower() for word in ["series", "result", "item"]))
+        series_items = SEARCH_RESULT_SELECTOR.select(soup)
 
         for item in series_items[:10]:
             title_elem = item.find("a") or item.find("span")
@@ -324,7 +570,7 @@ async def lookup(ctx, *, query):
                 title=f"🔎 Search Results for '{query}'",
                 url=search_url,
                 description=f"Found {len(results)} results",
-                color=discord.Color.from_rgb(204, 153, 255)
+                color=EMBED_COLOR
             )
 
             for result in results[:8]:
@@ -342,7 +588,7 @@ async def lookup(ctx, *, query):
                 title=f"🔎 Search Results for '{query}'",
                 url=search_url,
                 description="No results found. Click the link above to search directly on MangaUpdates.",
-                color=discord.Color.from_rgb(204, 153, 255)
+                color=EMBED_COLOR
             )
             await ctx.send(embed=embed)
 
@@ -353,7 +599,7 @@ async def lookup(ctx, *, query):
             title=f"🔎 Search for '{query}'",
             url=search_url,
             description="Click the link above to view results directly on MangaUpdates.",
-            color=discord.Color.from_rgb(204, 153, 255)
+            color=EMBED_COLOR
         )
         await ctx.send(embed=embed)
 
@@ -361,6 +607,56 @@ async def lookup(ctx, *, query):
 # --------------------------
 # Command: .randomseries
 # --------------------------
+def parse_series_page(html):
+    """Parse a series listing page into a list of {title, url} dicts"""
+    soup = BeautifulSoup(html, "lxml")
+    manhwa_list = []
+
+    for link in SERIES_LINK_SELECTOR.select(soup):
+        title = link.get_text(strip=True)
+        series_url = link.get('href', '')
+
+        if title and len(title) > 2:
+            full_url = f"https://www.mangaupdates.com{series_url}" if not series_url.startswith(
+                'http') else series_url
+            manhwa_list.append({
+                "title": title,
+                "url": full_url
+            })
+
+    return manhwa_list
+
+
+def parse_series_description(html):
+    """Extract a short description from a series detail page, if there is one"""
+    soup = BeautifulSoup(html, "lxml")
+    desc_elem = DESCRIPTION_SELECTOR.select_one(soup)
+    if not desc_elem:
+        return None
+    desc_text = desc_elem.get_text(strip=True)
+    return desc_text[:300] + "..." if len(desc_text) > 300 else desc_text
+
+
+# Per-letter series listings barely change, so keep them for a day
+LETTER_CACHE_TTL = 86400
+letter_cache = {}
+
+
+async def fetch_letter_series(letter):
+    cached = letter_cache.get(letter)
+    if cached and time.monotonic() - cached[0] < LETTER_CACHE_TTL:
+        return cached[1]
+
+    url = f"https://www.mangaupdates.com/series.html?letter={letter}&type=manhwa"
+    response = await mu_get(url, timeout=15)
+    response.raise_for_status()
+    manhwa_list = await asyncio.to_thread(parse_series_page, await response.text())
+
+    if manhwa_list:
+        letter_cache[letter] = (time.monotonic(), manhwa_list)
+    return manhwa_list
+
+
 @bot.command(name='randomseries')
 async def randomseries(ctx):
     """Get a random Manhwa from MangaUpdates"""
@@ -371,49 +667,14 @@ async def randomseries(ctx):
     loading_msg = await ctx.send("🎲 Finding a random Manhwa for you...")
 
     try:
-        letter = random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ0")
-        url = f"https://www.mangaupdates.com/series.html?letter={letter}&type=manhwa"
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        manhwa_list = []
-        series_links = soup.find_all("a", href=lambda x: x and "/series.html?id=" in str(x))
-
-        for link in series_links:
-            title = link.get_text(strip=True)
-            series_url = link.get('href', '')
-
-            if title and len(title) > 2:
-                full_url = f"https://www.mangaupdates.com{series_url}" if not series_url.startswith(
-                    'http') else series_url
-                manhwa_list.append({
-                    "title": title,
-                    "url": full_url
-                })
-
-        attempts = 0
-        while len(manhwa_list) == 0 and attempts < 3:
-            letter = random.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
-            url = f"https://www.mangaupdates.com/series.html?letter={letter}&type=manhwa"
-            response = requests.get(url, headers=headers, timeout=15)
-            soup = BeautifulSoup(response.text, "html.parser")
-            series_links = soup.find_all("a", href=lambda x: x and "/series.html?id=" in str(x))
-
-            for link in series_links:
-                title = link.get_text(strip=True)
-                series_url = link.get('href', '')
-                if title and len(title) > 2:
-                    full_url = f"https://www.mangaupdates.com{series_url}" if not series_url.startswith(
-                        'http') else series_url
-                    manhwa_list.append({"title": title, "url": full_url})
-
-            attempts += 1
+        # Try several letters at once and keep the first one that has results
+        letters = random.sample("ABCDEFGHIJKLMNOPQRSTUVWXYZ0", 4)
+        results = await asyncio.gather(*(fetch_letter_series(letter) for letter in letters),
+                                       return_exceptions=True)
+        for letter, result in zip(letters, results):
+            if isinstance(result, BaseException):
+                logging.error(f"Error in randomseries fetching letter {letter}: {result!r}")
+        manhwa_list = next((r for r in results if not isinstance(r, BaseException) and r), [])
 
         await loading_msg.delete()
 
@@ -421,14 +682,9 @@ async def randomseries(ctx):
             random_manhwa = random.choice(manhwa_list)
 
             try:
-                detail_response = requests.get(random_manhwa['url'], headers=headers, timeout=10)
-                detail_soup = BeautifulSoup(detail_response.text, "html.parser")
-
-                description = "Click the title to read more on MangaUpdates!"
-                desc_elem = detail_soup.find("div", class_=lambda x: x and "description" in str(x).lower())
-                if desc_elem:
-                    desc_text = desc_elem.get_text(strip=True)
-                    description = desc_text[:300] + "..." if len(desc_text) > 300 else desc_text
+                detail_response = await mu_get(random_manhwa['url'], timeout=10)
+                description = await asyncio.to_thread(parse_series_description, await detail_response.text())
+                description = description or "Click the title to read more on MangaUpdates!"
 
             except:
                 description = "Click the title to read more on MangaUpdates!"
@@ -437,7 +693,7 @@ async def randomseries(ctx):
                 title=f"🎲 Random Manhwa: {random_manhwa['title']}",
                 url=random_manhwa['url'],
                 description=description,
-                color=discord.Color.from_rgb(204, 153, 255)
+                color=EMBED_COLOR
             )
 
             if len(manhwa_list) > 1:
@@ -456,7 +712,7 @@ async def randomseries(ctx):
                 title="🎲 Random Manhwa",
                 url="https://www.mangaupdates.com/series.html?type=manhwa",
                 description="Click the link above to browse all Manhwa on MangaUpdates!",
-                color=discord.Color.from_rgb(204, 153, 255)
+                color=EMBED_COLOR
             )
             await ctx.send(embed=embed)
 
@@ -468,7 +724,7 @@ async def randomseries(ctx):
             title="🎲 Random Manhwa",
             url="https://www.mangaupdates.com/series.html?type=manhwa",
             description="Click the link above to browse all Manhwa on MangaUpdates!",
-            color=discord.Color.from_rgb(204, 153, 255)
+            color=EMBED_COLOR
         )
         await ctx.send(embed=embed)
 
@@ -481,15 +737,43 @@ async def randomseries(ctx):
 async def testfetch(ctx):
     """Test the scraping function (Admin only)"""
     await ctx.send("🧪 Testing fetch function...")
-    releases = fetch_releases_from_page()
+    releases = await fetch_releases_from_page()
 
     if releases:
         await ctx.send(
-            f"✅ Successfully fetched {len(releases)} releases!\n**First release:** {releases[0]['title']} - {releases[0]['chapter']} by {releases[0]['group']}")
+            f"✅ Successfully fetched {len(releases)} releases!\n**First release:** {releases[0].title} - {releases[0].chapter} by {releases[0].group}")
     else:
         await ctx.send("❌ Fetch returned no results. Check logs for details.")
 
 
+# --------------------------
+# Keep-Alive Web Server
+# --------------------------
+web_runner = None
+
+
+async def home(request):
+    return web.Response(text="Bot is running!")
+
+
+async def keep_alive():
+    """Serve the health check on the bot's own event loop"""
+    global web_runner
+    app = web.Application()
+    app.router.add_get('/', home)
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    try:
+        await web.TCPSite(runner, '0.0.0.0', 8080).start()
+    except OSError as e:
+        logging.error(f"❌ Keep-alive server failed to start: {e}")
+        await runner.cleanup()
+        return
+
+    web_runner = runner
+
+
 # --------------------------
 # Run Bot
 # --------------------------
@@ -502,23 +786,3 @@ if __name__ == "__main__":
     else:
         logging.error("❌ DISCORD_TOKEN not found. Make sure it's set in your environment variables.")
 
-from flask import Flask
-import threading
-
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "Bot is running!"
-
-def run():
-    app.run(host='0.0.0.0', port=8080)
-
-def keep_alive():
-    t = threading.Thread(target=run)
-    t.start()
-
-keep_alive()
-
-
-